@@ -0,0 +1,62 @@
+import random
+import time
+
+from engine import MIN_SIZE, MAX_SIZE, MOVES, PackedBoard, get_tables
+from test_engine import old_move
+
+TILES = [2, 4, 8, 16, 32, 64, 128, 256, 512, 1024]
+
+
+def random_boards(size, count, empty_share, rng):
+    """
+    Random boards where roughly empty_share of the cells are empty
+    """
+    return [[[0 if rng.random() < empty_share else rng.choice(TILES) for _ in range(size)] for _ in range(size)]
+            for _ in range(count)]
+
+
+def played_boards(size, count, rng):
+    """
+    Positions from games that play random moves, restarting whenever a game ends
+    """
+    boards = []
+    board = PackedBoard(size)
+    while len(boards) < count:
+        empty_cells = board.empty_cells()
+        if empty_cells:
+            i, j = rng.choice(empty_cells)
+            board = board.place(i, j, rng.choice([2, 4]))
+        if not board.can_move():
+            board = PackedBoard(size)
+            continue
+        boards.append(board.to_rows())
+        board = board.move(rng.choice(MOVES))[0]
+    return boards
+
+
+def time_moves(boards, move):
+    start = time.perf_counter()
+    for board in boards:
+        for direction in MOVES:
+            move(board, direction)
+    return time.perf_counter() - start
+
+
+def bench(name, size, boards):
+    packed = [PackedBoard.from_rows(size, board) for board in boards]
+    old = time_moves(boards, old_move)
+    new = time_moves(packed, PackedBoard.move)
+    print(f"{size}x{size}  {name:<8} old {old:.3f}s  packed {new:.3f}s  {old / new:.1f}x")
+
+
+if __name__ == "__main__":
+    rng = random.Random(0)
+    count = 2000
+    print(f"Moving {count} boards in all four directions")
+    for size in range(MIN_SIZE, MAX_SIZE + 1):
+        start = time.perf_counter()
+        PackedBoard(size).move("LEFT")
+        print(f"{size}x{size}  setup    {time.perf_counter() - start:.3f}s")
+        bench("dense", size, random_boards(size, count, 0.0, rng))
+        bench("sparse", size, random_boards(size, count, 0.5, rng))
+        bench("played", size, played_boards(size, count, rng))
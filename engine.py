@@ -0,0 +1,185 @@
+import functools
+import itertools
+import re
+
+# Supported board sizes
+MIN_SIZE = 2
+MAX_SIZE = 8
+MOVES = ("UP", "DOWN", "LEFT", "RIGHT")
+# Boards up to this size get a full table of every line with exponents below TABLE_EXPONENTS (65536 lines at 4x4).
+# A 5x5 table would already hold a million lines, so larger boards slide all their lines in one pass instead
+FULL_TABLE_MAX_SIZE = 4
+TABLE_EXPONENTS = 16
+# Joins lines when a whole board is slid at once; exponents never get near 255
+SEPARATOR = b"\xff"
+MERGE_PAIR = re.compile(rb"([^\xff])\1")
+MERGED = {bytes([e]): bytes([e + 1]) for e in range(1, 254)}
+
+
+class SizeTables:
+    """
+    Per-size lookup data: the slices that pick each line out of the packed cells for every
+    direction, and for small sizes a table of every slid line, built the first time it is needed
+    """
+    def __init__(self, size):
+        self.size = size
+        # Every line is read in the direction the tiles move, so right and down use reversed slices
+        self.lines = {
+            "LEFT": [slice(i * size, (i + 1) * size) for i in range(size)],
+            "RIGHT": [slice((i + 1) * size - 1, i * size - 1 if i else None, -1) for i in range(size)],
+            "UP": [slice(i, None, size) for i in range(size)],
+            "DOWN": [slice(size * (size - 1) + i, None, -size) for i in range(size)],
+        }
+        self.table = None
+
+    def get_table(self):
+        """
+        Returns a dict mapping every line to its slid line and score gain, building it on first use
+        """
+        if self.table is None:
+            self.table = {
+                bytes(line): slide_line(line, self.size)
+                for line in itertools.product(range(TABLE_EXPONENTS), repeat=self.size)
+            }
+        return self.table
+
+    def slide(self, cells, direction):
+        """
+        Slides every line of the packed cells in the given direction and returns the new cells and the score gained
+        """
+        lines = self.lines[direction]
+        out = bytearray(len(cells))
+        gain = 0
+        if self.size <= FULL_TABLE_MAX_SIZE:
+            table = self.get_table()
+            for line in lines:
+                cells_in_line = cells[line]
+                new_line, line_gain = table.get(cells_in_line) or slide_line(cells_in_line, self.size)
+                out[line] = new_line
+                gain += line_gain
+            return bytes(out), gain
+
+        # Join the lines with separators so one pass over the bytes compresses and merges all of them
+        joined = SEPARATOR.join([cells[line] for line in lines]).replace(b"\0", b"")
+        merges = MERGE_PAIR.findall(joined)
+        if merges:
+            joined = MERGE_PAIR.sub(lambda match: MERGED[match.group(1)], joined)
+            gain = sum([2 << merge[0] for merge in merges])
+        for line, new_line in zip(lines, joined.split(SEPARATOR)):
+            out[line] = new_line.ljust(self.size, b"\0")
+        return bytes(out), gain
+
+
+@functools.lru_cache(maxsize=None)
+def get_tables(size):
+    """
+    Returns the lookup data for a board size, creating it the first time the size is used
+    """
+    if not MIN_SIZE <= size <= MAX_SIZE:
+        raise ValueError(f"Board size must be between {MIN_SIZE} and {MAX_SIZE}, got {size}")
+    return SizeTables(size)
+
+
+def slide_line(line, size):
+    """
+    Compresses, merges and compresses a line of exponents, the same way a row moves left in the game
+    """
+    tiles = [e for e in line if e != 0]
+    merged = []
+    gain = 0
+    i = 0
+    while i < len(tiles):
+        if i + 1 < len(tiles) and tiles[i] == tiles[i + 1]:
+            merged.append(tiles[i] + 1)
+            gain += 1 << (tiles[i] + 1)
+            i += 2
+        else:
+            merged.append(tiles[i])
+            i += 1
+    merged += [0] * (size - len(merged))
+    return bytes(merged), gain
+
+
+def to_exponent(value):
+    """
+    Converts a tile value (0, 2, 4, 8, ...) to the exponent stored in a cell
+    """
+    return value.bit_length() - 1 if value else 0
+
+
+def to_value(exponent):
+    """
+    Converts a stored exponent back to the tile value
+    """
+    return 1 << exponent if exponent else 0
+
+
+class PackedBoard:
+    """
+    Immutable N x N board stored as one byte per cell, holding the log2 of the tile (0 for empty).
+    Rows are contiguous slices and columns are strided slices of the same bytes object.
+    """
+    def __init__(self, size, cells=None):
+        self.tables = get_tables(size)
+        self.size = size
+        self.cells = bytes(size * size) if cells is None else bytes(cells)
+        if len(self.cells) != size * size:
+            raise ValueError(f"Expected {size * size} cells, got {len(self.cells)}")
+
+    @classmethod
+    def from_rows(cls, size, rows):
+        """
+        Packs a list of lists of tile values
+        """
+        if len(rows) != size or any(len(row) != size for row in rows):
+            raise ValueError(f"Board must be {size}x{size}")
+        return cls(size, [to_exponent(value) for row in rows for value in row])
+
+    def to_rows(self):
+        """
+        Unpacks the board into a new list of lists of tile values
+        """
+        n = self.size
+        return [[to_value(e) for e in self.cells[i * n:(i + 1) * n]] for i in range(n)]
+
+    def __eq__(self, other):
+        return isinstance(other, PackedBoard) and self.cells == other.cells
+
+    def __hash__(self):
+        return hash(self.cells)
+
+    def move(self, direction):
+        """
+        Returns the board after moving in the given direction, the score gained and whether anything moved
+        """
+        cells, gain = self.tables.slide(self.cells, direction)
+        if cells == self.cells:
+            return self, 0, False
+        return PackedBoard(self.size, cells), gain, True
+
+    def empty_cells(self):
+        """
+        Returns the (row, column) positions of all empty cells
+        """
+        n = self.size
+        return [divmod(i, n) for i, e in enumerate(self.cells) if e == 0]
+
+    def place(self, row, col, value):
+        """
+        Returns a new board with the tile value placed at (row, col)
+        """
+        out = bytearray(self.cells)
+        out[row * self.size + col] = to_exponent(value)
+        return PackedBoard(self.size, out)
+
+    def can_move(self):
+        """
+        Checks if there are any empty cells or any adjacent cells with the same value
+        """
+        if 0 in self.cells:
+            return True
+        for line in self.tables.lines["LEFT"] + self.tables.lines["UP"]:
+            cells = self.cells[line]
+            if any(a == b for a, b in zip(cells, cells[1:])):
+                return True
+        return False
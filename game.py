@@ -1,15 +1,23 @@
-import pygame
 import sys
 import random
 import copy
 
+from engine import PackedBoard
+
+try:
+    import pygame
+except ImportError:  # Only needed to draw the board; simulation and tuning run without it
+    pygame = None
+
 # Constants for the game
 SIZE = 4
 TILE_SIZE = 100
 MARGIN = 10
-WIDTH = SIZE * TILE_SIZE + (SIZE + 1) * MARGIN
-HEIGHT = WIDTH
+DEFAULT_WIDTH = SIZE * TILE_SIZE + (SIZE + 1) * MARGIN
+SCORE_HEIGHT = 100  # Extra space below the board for the score
 FONT_SIZE = 36
+SCORE_FONT_SIZE = 24
+GAME_OVER_FONT_SIZE = 72
 BACKGROUND_COLOR = (187, 173, 160)
 TILE_COLORS = {
     0: (205, 193, 180),
@@ -32,131 +40,104 @@ SCORE_COLOR = (255, 255, 255)
 
 # Game Class
 class Game2048:
-    def __init__(self, size=4):
+    def __init__(self, size=SIZE, initial_board=None, rng=random):
         self.size = size
-        self.board = [[0] * size for _ in range(size)]
+        self.rng = rng  # Source of new tiles; pass a random.Random for reproducible games
+        self.cells = PackedBoard.from_rows(size, initial_board) if initial_board else PackedBoard(size)
         self.score = 0
         self.add_new_tile()
         self.add_new_tile()
+
+        # Tiles shrink on boards larger than the default so the window stays the same size
+        self.tile_size = TILE_SIZE * SIZE // max(size, SIZE)
+        self.margin = MARGIN * SIZE // max(size, SIZE)
+        self.width = size * self.tile_size + (size + 1) * self.margin
+        self.height = self.width
+        self.screen = None
+
+    def __str__(self):
+        return '\n'.join(['\t'.join(map(str, row)) for row in self.board])
+
+    @property
+    def board(self):
+        """
+        The board as a list of lists of tile values. This is a copy, so assign to it rather than editing it in place
+        """
+        return self.cells.to_rows()
+
+    @board.setter
+    def board(self, rows):
+        self.cells = PackedBoard.from_rows(self.size, rows)
+
+    def init_display(self):
+        """
+        Opens the game window, sized for the board. Only called once something is drawn, so games used for simulation stay headless
+        """
+        if pygame is None:
+            raise RuntimeError("pygame is needed to draw the board, install it with: pip install pygame")
         pygame.init()
-        self.screen = pygame.display.set_mode((WIDTH, HEIGHT + 100))  # Extra space for score
+        self.screen = pygame.display.set_mode((self.width, self.height + SCORE_HEIGHT))
         pygame.display.set_caption('2048')
-        self.font = pygame.font.SysFont('arial', FONT_SIZE)
-        self.score_font = pygame.font.SysFont('arial', 24)
+        self.font = pygame.font.SysFont('arial', FONT_SIZE * self.tile_size // TILE_SIZE)
+        # The score and game over text scale with the window, which is narrower than the default on small boards
+        self.score_font = pygame.font.SysFont('arial', SCORE_FONT_SIZE * self.width // DEFAULT_WIDTH)
 
     def add_new_tile(self):
         """
         Adds a new tile (2 or 4) to a random empty cell on the board
         """
-        empty_cells = [(i, j) for i in range(self.size) for j in range(self.size) if self.board[i][j] == 0]
+        empty_cells = self.cells.empty_cells()
         if not empty_cells:
             return False
-        i, j = random.choice(empty_cells)
-        self.board[i][j] = random.choice([2, 4])
+        i, j = self.rng.choice(empty_cells)
+        self.cells = self.cells.place(i, j, self.rng.choice([2, 4]))
         return True
 
-    def compress(self, row):
-        """
-        Compress the row by moving all non-zero elements to the left side
-        """
-        new_row = [i for i in row if i != 0]
-        new_row += [0] * (self.size - len(new_row))
-        return new_row
-
-    def merge(self, row):
+    def move(self, direction):
         """
-        Merge the row by adding the same adjacent elements
+        Moves all tiles in the given direction ("UP", "DOWN", "LEFT" or "RIGHT") and merges them
         """
-        for i in range(self.size - 1):
-            if row[i] == row[i + 1] and row[i] != 0:
-                row[i] *= 2
-                self.score += row[i]
-                row[i + 1] = 0
-        return row
+        self.cells, gain, changed = self.cells.move(direction)
+        self.score += gain
+        return changed
 
     def move_left(self):
-        """
-        Move all tiles to the left and merge
-        """
-        changed = False
-        new_board = []
-        for row in self.board:
-            compressed_row = self.compress(row)
-            merged_row = self.merge(compressed_row)
-            final_row = self.compress(merged_row)
-            if final_row != row:
-                changed = True
-            new_board.append(final_row)
-        self.board = new_board
-        return changed
+        return self.move("LEFT")
 
     def move_right(self):
-        """
-        Flips the board and moves left and then flips it back
-        """
-        self.reverse()
-        changed = self.move_left()
-        self.reverse()
-        return changed
+        return self.move("RIGHT")
 
     def move_up(self):
-        """
-        Turns the board, moves left and then turns it back
-        """
-        self.transpose()
-        changed = self.move_left()
-        self.transpose()
-        return changed
+        return self.move("UP")
 
     def move_down(self):
-        """
-        Turns the board, moves right (which flips it, compresses it, and flips it back) and then turns it back
-        """
-        self.transpose()
-        changed = self.move_right()
-        self.transpose()
-        return changed
-
-    def reverse(self):
-        """
-        Reverses all the rows of the board
-        """
-        for i in range(self.size):
-            self.board[i] = self.board[i][::-1]
-
-    def transpose(self):
-        """
-        Turns the columns of the board into rows
-        """
-        self.board = [list(row) for row in zip(*self.board)]
+        return self.move("DOWN")
 
     def is_game_over(self):
         """
         Check if the game is over by checking if there are any empty cells or if there are any adjacent cells with the same value
         """
-        for i in range(self.size):
-            for j in range(self.size):
-                if self.board[i][j] == 0:
-                    return False
-                if i < self.size - 1 and self.board[i][j] == self.board[i + 1][j]:
-                    return False
-                if j < self.size - 1 and self.board[i][j] == self.board[i][j + 1]:
-                    return False
-        return True
+        return not self.cells.can_move()
+
+    def is_move_possible(self):
+        return self.cells.can_move()
 
     def draw_board(self):
         """
         Draw the board on the screen
         """
+        if self.screen is None:
+            self.init_display()
         self.screen.fill(BACKGROUND_COLOR)
+        board = self.board
         for row in range(self.size):
             for col in range(self.size):
-                value = self.board[row][col]
+                value = board[row][col]
                 color = TILE_COLORS.get(value, TILE_COLORS[8192])
                 rect = pygame.Rect(
-                    MARGIN + col * (TILE_SIZE + MARGIN),
-                    MARGIN + row * (TILE_SIZE + MARGIN),
-                    TILE_SIZE, TILE_SIZE
+                    self.margin + col * (self.tile_size + self.margin),
+                    self.margin + row * (self.tile_size + self.margin),
+                    self.tile_size, self.tile_size
                 )
                 pygame.draw.rect(self.screen, color, rect)
                 if value != 0:
@@ -166,7 +147,7 @@ class Game2048:
 
         # Draw the score
         score_surface = self.score_font.render(f"Score: {self.score}", True, SCORE_COLOR)
-        self.screen.blit(score_surface, (MARGIN, HEIGHT + MARGIN))
+        self.screen.blit(score_surface, (self.margin, self.height + self.margin))
 
         pygame.display.update()
 
@@ -175,23 +156,25 @@ class Game2048:
         Handles the game over screen and allows the player to restart or quit
         """
         self.draw_board()
-        font = pygame.font.SysFont('arial', 72)
+        font = pygame.font.SysFont('arial', GAME_OVER_FONT_SIZE * self.width // DEFAULT_WIDTH)
         text_surface = font.render("Game Over!", True, TEXT_COLOR)
-        text_rect = text_surface.get_rect(center=(WIDTH // 2, HEIGHT // 2))
+        text_rect = text_surface.get_rect(center=(self.width // 2, self.height // 2))
         self.screen.blit(text_surface, text_rect)
 
         pygame.display.update()
         pygame.time.wait(2000)
 
-        # Restart the game
-        self.__init__(self.size)
+        # Restart the game, keeping the window
+        screen = self.screen
+        self.__init__(self.size, rng=self.rng)
+        self.screen = screen
 
     def play(self):
         """
         Main game loop that handles drawing and user input
         """
         running = True
-        ai = WordleAI(self)
+        ai = WordleAI(self, load_weights(size=self.size))
         while running:
             self.draw_board()
             for event in pygame.event.get():
@@ -232,10 +215,37 @@ class Game2048:
 
 
 import math
+import json
+import os
+
+WEIGHTS_FILE = "weights.json"
+DEFAULT_WEIGHTS = {
+    "score": 1.0,
+    "monotonicity": 1.0,
+    "clustering": 1.0,
+    "corner_preference": 1.0,
+    "empty_cells": 10.0,
+}
+
+def load_weights(filename=WEIGHTS_FILE, size=None):
+    """
+    Loads heuristic weights from a JSON config file (as written by tune.py), falling back to the defaults for anything missing.
+    If a size is given and the weights were tuned for a different board size, the defaults are used instead
+    """
+    weights = dict(DEFAULT_WEIGHTS)
+    if os.path.exists(filename):
+        with open(filename) as file:
+            config = json.load(file)
+        if size is not None and config.get("size", size) != size:
+            print(f"Ignoring {filename}: tuned for a {config['size']}x{config['size']} board, not {size}x{size}")
+            return weights
+        weights.update({name: float(value) for name, value in config.get("weights", {}).items() if name in DEFAULT_WEIGHTS})
+    return weights
 
 class WordleAI:
-    def __init__(self, game):
+    def __init__(self, game, weights=None):
         self.game = game
+        self.weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
 
     def simulate_move(self, board, score, move):
         """
@@ -317,7 +327,9 @@ class WordleAI:
         empty_cells = sum([1 for i in range(self.game.size) for j in range(self.game.size) if board[i][j] == 0])
 
         # Combine scores, giving weight to each heuristic
-        total_score = score + monotonicity + clustering + corner_preference + math.log2(empty_cells + 1) * 10
+        w = self.weights
+        total_score = w["score"] * score + w["monotonicity"] * monotonicity + w["clustering"] * clustering + \
+            w["corner_preference"] * corner_preference + w["empty_cells"] * math.log2(empty_cells + 1)
         return total_score
 
     def get_best_move(self):
@@ -325,7 +337,7 @@ class WordleAI:
         Determines the best move by looking ahead up to 3 moves, considering board heuristics and probabilities.
         """
         moves = ["UP", "DOWN", "LEFT", "RIGHT"]
-        best_score = -1
+        best_score = -math.inf
         best_move = None
         best_sequence = []
 
@@ -0,0 +1,156 @@
+import copy
+import itertools
+import random
+
+import pytest
+
+from engine import MOVES, PackedBoard
+from game import Game2048
+from generate import generate_possible_sequences
+
+
+def old_move_left(board):
+    """
+    The list-of-lists compress, merge, compress rules the game used before the packed engine
+    """
+    size = len(board)
+    score = 0
+    new_board = []
+    for row in board:
+        new_row = [i for i in row if i != 0]
+        new_row += [0] * (size - len(new_row))
+        for i in range(size - 1):
+            if new_row[i] == new_row[i + 1] and new_row[i] != 0:
+                new_row[i] *= 2
+                score += new_row[i]
+                new_row[i + 1] = 0
+        final_row = [i for i in new_row if i != 0]
+        final_row += [0] * (size - len(final_row))
+        new_board.append(final_row)
+    return new_board, score, new_board != board
+
+
+def old_move(board, direction):
+    """
+    Moves by reversing and transposing around a left move, as the old Game2048 did
+    """
+    def reverse(b):
+        return [row[::-1] for row in b]
+
+    def transpose(b):
+        return [list(row) for row in zip(*b)]
+
+    if direction == "LEFT":
+        return old_move_left(board)
+    if direction == "RIGHT":
+        new_board, score, changed = old_move_left(reverse(board))
+        return reverse(new_board), score, changed
+    if direction == "UP":
+        new_board, score, changed = old_move_left(transpose(board))
+        return transpose(new_board), score, changed
+    new_board, score, changed = old_move(transpose(board), "RIGHT")
+    return transpose(new_board), score, changed
+
+
+def old_is_game_over(board):
+    size = len(board)
+    for i in range(size):
+        for j in range(size):
+            if board[i][j] == 0:
+                return False
+            if i < size - 1 and board[i][j] == board[i + 1][j]:
+                return False
+            if j < size - 1 and board[i][j] == board[i][j + 1]:
+                return False
+    return True
+
+
+@pytest.mark.parametrize("row, expected, score", [
+    ([2, 2, 2, 2], [4, 4, 0, 0], 8),
+    ([4, 4, 8, 0], [8, 8, 0, 0], 8),
+    ([4, 4, 8, 8], [8, 16, 0, 0], 24),
+    ([2, 0, 0, 2], [4, 0, 0, 0], 4),
+    ([2, 2, 2, 0], [4, 2, 0, 0], 4),
+    ([2, 4, 8, 16], [2, 4, 8, 16], 0),
+    ([4, 4, 8, 16, 16, 2, 2, 0], [8, 8, 32, 4, 0, 0, 0, 0], 44),
+])
+def test_move_left_row(row, expected, score):
+    size = len(row)
+    rows = [row] + [[0] * size for _ in range(size - 1)]
+    board, gain, changed = PackedBoard.from_rows(size, rows).move("LEFT")
+    assert board.to_rows()[0] == expected
+    assert gain == score
+    assert changed == (expected != row)
+
+
+@pytest.mark.parametrize("size", range(2, 9))
+def test_matches_old_rules(size):
+    rng = random.Random(size)
+    for _ in range(500):
+        rows = [[rng.choice([0, 0, 2, 2, 4, 8, 16, 1 << 20]) for _ in range(size)] for _ in range(size)]
+        board = PackedBoard.from_rows(size, rows)
+        for direction in MOVES:
+            new_board, gain, changed = board.move(direction)
+            assert (new_board.to_rows(), gain, changed) == old_move(rows, direction)
+        assert board.can_move() == (not old_is_game_over(rows))
+
+
+def test_full_board_game_over():
+    rows = [[2, 4, 2, 4], [4, 2, 4, 2], [2, 4, 2, 4], [4, 2, 4, 2]]
+    assert not PackedBoard.from_rows(4, rows).can_move()
+    rows[3][3] = 4
+    assert PackedBoard.from_rows(4, rows).can_move()
+
+
+def test_rows_round_trip():
+    rows = [[0, 2, 4, 8, 16], [32, 64, 128, 256, 512], [1024, 2048, 4096, 8192, 1 << 17], [0] * 5, [2] * 5]
+    assert PackedBoard.from_rows(5, rows).to_rows() == rows
+
+
+def test_invalid_sizes():
+    with pytest.raises(ValueError):
+        PackedBoard(9)
+    with pytest.raises(ValueError):
+        PackedBoard.from_rows(4, [[0] * 4] * 3)
+
+
+def test_game_board_round_trip():
+    rows = [[2, 4, 0, 0, 0, 0], [0] * 6, [0] * 6, [0] * 6, [0] * 6, [0, 0, 0, 0, 0, 1024]]
+    game = Game2048(6)
+    game.board = rows
+    assert game.board == rows
+    # The property hands out copies, so editing one leaves the game untouched
+    game.board[0][0] = 8
+    assert game.board == rows
+    assert game.move_left()
+    assert game.board[0][:2] == [2, 4]
+    assert game.board[5][0] == 1024
+
+
+def test_initial_board():
+    rows = [[2, 4, 0, 0], [4, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0]]
+    game = Game2048(initial_board=copy.deepcopy(rows), rng=random.Random(0))
+    board = game.board
+    # The starting tiles are kept and two new ones are added
+    assert board[0][:2] == [2, 4] and board[1][0] == 4
+    assert sum(1 for row in board for value in row if value) == 5
+
+    full = [[2, 4, 2, 4], [4, 2, 4, 2], [2, 4, 2, 4], [4, 2, 4, 2]]
+    assert Game2048(initial_board=copy.deepcopy(full)).board == full
+
+
+def test_generate_possible_sequences_matches_old_rules():
+    # A full board, so creating the games in generate_possible_sequences adds no random tiles
+    rows = [[2, 4, 8, 16], [4, 8, 16, 32], [2, 2, 4, 4], [8, 8, 16, 2]]
+    expected = []
+    for seq in itertools.product(["UP", "DOWN", "LEFT", "RIGHT"], repeat=3):
+        board = rows
+        for move in seq:
+            board, _, changed = old_move(board, move)
+            if not changed:
+                break
+        else:
+            if not old_is_game_over(board):
+                expected.append((seq, board))
+    assert expected
+    assert generate_possible_sequences(Game2048(4, copy.deepcopy(rows)), 3) == expected
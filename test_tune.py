@@ -0,0 +1,127 @@
+import itertools
+import json
+import random
+
+import pytest
+
+import tune
+from game import DEFAULT_WEIGHTS, load_weights
+
+
+class SerialPool:
+    """
+    Stands in for multiprocessing.Pool so the tuning loop runs in the test process
+    """
+    def __init__(self, workers=None):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def starmap(self, function, tasks, chunksize=None):
+        return list(itertools.starmap(function, tasks))
+
+
+def fake_play_game(size, weights, seed, max_moves, depth=1):
+    """
+    A quick stand-in for self-play: the score grows with the empty cells weight, plus noise fixed by the seed and weights
+    """
+    return weights["empty_cells"] * 100 + random.Random(f"{seed}-{weights['empty_cells']}").randint(0, 100)
+
+
+@pytest.fixture
+def serial_tuning(monkeypatch, tmp_path):
+    monkeypatch.setattr(tune.multiprocessing, "Pool", SerialPool)
+    monkeypatch.setattr(tune, "play_game", fake_play_game)
+    monkeypatch.chdir(tmp_path)
+
+
+def make_args(*extra):
+    return tune.parse_args(["--candidates", "4", "--games", "3", "--rounds", "2", "--eval-games", "4", *extra])
+
+
+def test_clearly_worse_pairs_games_by_seed():
+    # Always exactly one point behind on the same seeds: clearly worse, even though the scores overlap a lot
+    assert tune.is_clearly_worse([100, 200, 300, 400], [101, 201, 301, 401], 2.0)
+    # Behind on average, but the paired differences are too noisy to tell
+    assert not tune.is_clearly_worse([90, 205, 95, 204], [100, 200, 100, 200], 2.0)
+    # Consistently ahead
+    assert not tune.is_clearly_worse([110, 210, 310], [100, 200, 300], 2.0)
+    # A single game is never enough to drop a candidate
+    assert not tune.is_clearly_worse([0], [1000], 2.0)
+
+
+def test_leader_ignores_dropped_candidates():
+    state = {"scores": [[100, 120], [900, 950], [300, 280]], "alive": [True, False, True]}
+    assert tune.get_leader(state) == 2
+
+
+def test_run_round_drops_clearly_worse(serial_tuning):
+    args = make_args()
+    state = tune.new_generation(args, 0, dict(DEFAULT_WEIGHTS))
+    state["candidates"] = [dict(DEFAULT_WEIGHTS, empty_cells=value) for value in (10.0, 20.0, 19.9, 1.0)]
+    with SerialPool() as pool:
+        tune.run_round(args, pool, state)
+        tune.run_round(args, pool, state)
+    assert state["round"] == 2
+    # The candidates far behind are dropped after the first round; the close one stays in the race
+    assert state["alive"] == [False, True, True, False]
+    assert [len(scores) for scores in state["scores"]] == [3, 6, 6, 3]
+    assert tune.get_leader(state) == 1
+
+
+def test_game_seeds():
+    args = make_args()
+    seeds = [tune.game_seeds(args, generation, round_index) for generation in range(3) for round_index in range(2)]
+    # Replaying the same generation and round gives the same games, and no two rounds share a game
+    assert tune.game_seeds(args, 1, 1) == seeds[3]
+    assert len(set(itertools.chain(*seeds))) == 3 * 2 * 3
+
+
+def test_resume_after_last_round_of_generation(serial_tuning):
+    args = make_args("--generations", "2", "--resume")
+    state = tune.new_generation(args, 1, dict(DEFAULT_WEIGHTS))
+    state["candidates"][2] = dict(DEFAULT_WEIGHTS, empty_cells=50.0)
+    with SerialPool() as pool:
+        while state["round"] < args.rounds:
+            tune.run_round(args, pool, state)
+    history = [{"generation": 0, "weights": dict(DEFAULT_WEIGHTS), "mean_score": 1000.0, "games": 6}]
+    tune.save_json({"config": tune.config_of(args), "state": state, "history": history}, args.checkpoint)
+
+    tune.tune(args)
+
+    with open(args.checkpoint) as file:
+        checkpoint = json.load(file)
+    assert checkpoint["state"]["generation"] == 2
+    assert checkpoint["history"][-1]["weights"]["empty_cells"] == 50.0
+    with open(args.output) as file:
+        exported = json.load(file)
+    assert exported["weights"]["empty_cells"] == 50.0
+    assert exported["mean_score"] > exported["default_mean_score"]
+
+
+def test_resume_refuses_different_settings(serial_tuning):
+    tune.tune(make_args("--generations", "1"))
+    with pytest.raises(SystemExit):
+        tune.tune(make_args("--generations", "2", "--drop-z", "3", "--resume"))
+
+
+def test_play_game_is_repeatable():
+    first = tune.play_game(4, DEFAULT_WEIGHTS, 7, 200)
+    assert first > 0
+    assert tune.play_game(4, DEFAULT_WEIGHTS, 7, 200) == first
+
+
+def test_load_weights(tmp_path):
+    filename = tmp_path / "weights.json"
+    filename.write_text(json.dumps({"size": 8, "weights": {"empty_cells": 30.0}}))
+    assert load_weights(str(filename), size=8)["empty_cells"] == 30.0
+    # Weights tuned on another board size are not used
+    assert load_weights(str(filename), size=4) == DEFAULT_WEIGHTS
+
+    filename.write_text("{}")
+    assert load_weights(str(filename), size=4) == DEFAULT_WEIGHTS
+    assert load_weights(str(tmp_path / "missing.json")) == DEFAULT_WEIGHTS
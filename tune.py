@@ -0,0 +1,251 @@
+import os
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import json
+import math
+import multiprocessing
+import random
+
+from engine import MOVES, MIN_SIZE, MAX_SIZE
+from game import Game2048, WordleAI, DEFAULT_WEIGHTS, WEIGHTS_FILE, SIZE
+
+CHECKPOINT_FILE = "tune_checkpoint.json"
+
+
+def search_value(ai, cells, score, depth):
+    """
+    Values the board left by a move. At depth 1 this is the AI's heuristic score; deeper, it averages over every
+    new tile that can appear the value of the best move that follows
+    """
+    empty_cells = cells.empty_cells()
+    if depth <= 1 or not empty_cells:
+        return ai.calculate_board_score(cells.to_rows(), score)
+    total = 0
+    for i, j in empty_cells:
+        for value in [2, 4]:
+            spawned = cells.place(i, j, value)
+            best_value = -math.inf
+            for move in MOVES:
+                next_cells, gain, changed = spawned.move(move)
+                if changed:
+                    best_value = max(best_value, search_value(ai, next_cells, score + gain, depth - 1))
+            if best_value == -math.inf:
+                # No move is left after this tile, so the game ends here
+                best_value = ai.calculate_board_score(spawned.to_rows(), score)
+            total += best_value
+    return total / (len(empty_cells) * 2)
+
+
+def choose_move(game, ai, depth=1):
+    """
+    Picks the move whose resulting board scores best under the AI's weighted heuristics, looking depth moves ahead.
+    Returns the move with the board and score gain it leads to, or None if no move changes the board
+    """
+    best = None
+    best_score = -math.inf
+    for move in MOVES:
+        cells, gain, changed = game.cells.move(move)
+        if not changed:
+            continue
+        move_score = search_value(ai, cells, game.score + gain, depth)
+        if move_score > best_score:
+            best_score = move_score
+            best = (move, cells, gain)
+    return best
+
+
+def play_game(size, weights, seed, max_moves, depth=1):
+    """
+    Plays one headless game with the given weights and returns the final score.
+    Candidates given the same seed start from the same random number stream; their tiles only drift apart once their boards differ.
+    """
+    game = Game2048(size, rng=random.Random(seed))
+    ai = WordleAI(game, weights)
+    for _ in range(max_moves):
+        best = choose_move(game, ai, depth)
+        if best is None:
+            break
+        # Apply the board choose_move already computed rather than moving again
+        _, game.cells, gain = best
+        game.score += gain
+        game.add_new_tile()
+    return game.score
+
+
+def sample_candidates(center, count, spread, rng):
+    """
+    Returns the center weights followed by count - 1 copies with every weight scaled by a random log-normal factor
+    """
+    candidates = [dict(center)]
+    for _ in range(count - 1):
+        candidates.append({name: value * math.exp(rng.gauss(0, spread)) for name, value in center.items()})
+    return candidates
+
+
+def mean(values):
+    return sum(values) / len(values)
+
+
+def get_leader(state):
+    """
+    Returns the index of the candidate still in the race with the highest mean score
+    """
+    alive = [i for i, is_alive in enumerate(state["alive"]) if is_alive]
+    return max(alive, key=lambda i: mean(state["scores"][i]))
+
+
+def is_clearly_worse(scores, leader_scores, z):
+    """
+    Checks if a candidate is behind the leader by more than z standard errors, pairing up games played on the same seed
+    """
+    diffs = [a - b for a, b in zip(scores, leader_scores)]
+    if len(diffs) < 2:
+        return False
+    avg = mean(diffs)
+    variance = sum((d - avg) ** 2 for d in diffs) / (len(diffs) - 1)
+    return avg + z * math.sqrt(variance / len(diffs)) < 0
+
+
+def game_seeds(args, generation, round_index):
+    """
+    Seeds for one round of one generation. They only depend on the settings, so a resumed run replays the same games
+    """
+    first = args.seed * 10 ** 9 + (generation * args.rounds + round_index) * args.games
+    return [first + k for k in range(args.games)]
+
+
+def save_json(data, filename):
+    """
+    Writes JSON to a temporary file first, so an interrupted run never leaves a half written file behind
+    """
+    temp_filename = filename + ".tmp"
+    with open(temp_filename, 'w') as file:
+        json.dump(data, file, indent=2)
+    os.replace(temp_filename, filename)
+
+
+def new_generation(args, generation, center):
+    rng = random.Random(f"{args.seed}-{generation}")
+    candidates = sample_candidates(center, args.candidates, args.spread, rng)
+    return {
+        "generation": generation,
+        "round": 0,
+        "center": center,
+        "candidates": candidates,
+        "scores": [[] for _ in candidates],
+        "alive": [True] * len(candidates),
+    }
+
+
+def run_round(args, pool, state):
+    """
+    Plays the next round of games for every candidate still in the race, then drops the ones that are clearly worse than the leader
+    """
+    seeds = game_seeds(args, state["generation"], state["round"])
+    alive = [i for i, is_alive in enumerate(state["alive"]) if is_alive]
+    tasks = [(args.size, state["candidates"][i], seed, args.max_moves, args.depth) for i in alive for seed in seeds]
+    results = pool.starmap(play_game, tasks, chunksize=1)
+    for n, i in enumerate(alive):
+        state["scores"][i].extend(results[n * len(seeds):(n + 1) * len(seeds)])
+
+    leader = get_leader(state)
+    for i in alive:
+        if i != leader and is_clearly_worse(state["scores"][i], state["scores"][leader], args.drop_z):
+            state["alive"][i] = False
+    state["round"] += 1
+
+
+def evaluate(args, pool, weights):
+    """
+    Plays the tuned and the default weights on the same fresh seeds, none of which were used to pick the winner,
+    and returns the mean score of each
+    """
+    seeds = [f"eval-{args.seed}-{k}" for k in range(args.eval_games)]
+    tasks = [(args.size, w, seed, args.max_moves, args.depth) for w in (weights, DEFAULT_WEIGHTS) for seed in seeds]
+    results = pool.starmap(play_game, tasks, chunksize=1)
+    return mean(results[:len(seeds)]), mean(results[len(seeds):])
+
+
+def config_of(args):
+    return {name: getattr(args, name) for name in ("size", "candidates", "games", "rounds", "spread", "drop_z", "max_moves", "depth", "seed")}
+
+
+def tune(args):
+    """
+    Runs the tuning generations, checkpointing after every round, and exports the best weights found
+    """
+    if args.resume and os.path.exists(args.checkpoint):
+        with open(args.checkpoint) as file:
+            checkpoint = json.load(file)
+        if checkpoint["config"] != config_of(args):
+            raise SystemExit(f"{args.checkpoint} was written with different settings: {checkpoint['config']}")
+        state = checkpoint["state"]
+        history = checkpoint["history"]
+        print(f"Resuming generation {state['generation']} at round {state['round']}")
+    else:
+        state = new_generation(args, 0, dict(DEFAULT_WEIGHTS))
+        history = []
+
+    with multiprocessing.Pool(args.workers) as pool:
+        while state["generation"] < args.generations:
+            while state["round"] < args.rounds:
+                run_round(args, pool, state)
+                leader = get_leader(state)
+                print(f"Generation {state['generation']} round {state['round']}: "
+                      f"{sum(state['alive'])}/{len(state['alive'])} candidates left, "
+                      f"leader mean score {mean(state['scores'][leader]):.1f}")
+                save_json({"config": config_of(args), "state": state, "history": history}, args.checkpoint)
+
+            leader = get_leader(state)
+            best = state["candidates"][leader]
+            history.append({"generation": state["generation"], "weights": best, "mean_score": mean(state["scores"][leader]), "games": len(state["scores"][leader])})
+            state = new_generation(args, state["generation"] + 1, best)
+            save_json({"config": config_of(args), "state": state, "history": history}, args.checkpoint)
+
+        best = history[-1]
+        mean_score, default_mean_score = evaluate(args, pool, best["weights"])
+
+    save_json({
+        "size": args.size,
+        "depth": args.depth,
+        "weights": best["weights"],
+        "mean_score": mean_score,
+        "default_mean_score": default_mean_score,
+        "eval_games": args.eval_games,
+        "tuning_mean_score": best["mean_score"],
+        "tuning_games": best["games"],
+    }, args.output)
+    print(f"Best weights {best['weights']} saved to {args.output}")
+    print(f"Mean score over {args.eval_games} fresh games: {mean_score:.1f} tuned, {default_mean_score:.1f} default")
+
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Tune the WordleAI heuristic weights with headless self-play")
+    parser.add_argument("--size", type=int, default=SIZE, choices=range(MIN_SIZE, MAX_SIZE + 1), help="board size")
+    parser.add_argument("--generations", type=positive_int, default=5, help="number of generations, each sampled around the previous winner")
+    parser.add_argument("--candidates", type=positive_int, default=16, help="weight vectors per generation, including the previous winner")
+    parser.add_argument("--games", type=positive_int, default=8, help="games per candidate in each round")
+    parser.add_argument("--rounds", type=positive_int, default=4, help="rounds per generation; clearly worse candidates are dropped after each")
+    parser.add_argument("--spread", type=float, default=0.5, help="standard deviation of the log-normal weight perturbation")
+    parser.add_argument("--drop-z", type=float, default=2.0, help="standard errors behind the leader before a candidate is dropped")
+    parser.add_argument("--max-moves", type=positive_int, default=5000, help="moves after which a game is cut off")
+    parser.add_argument("--depth", type=positive_int, default=1, help="moves the self-play policy looks ahead")
+    parser.add_argument("--eval-games", type=positive_int, default=32, help="fresh games used to compare the winner with the default weights")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the candidates and the shared game seeds")
+    parser.add_argument("--workers", type=positive_int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--checkpoint", default=CHECKPOINT_FILE, help="checkpoint file written after every round")
+    parser.add_argument("--resume", action="store_true", help="continue from the checkpoint file if it exists")
+    parser.add_argument("--output", default=WEIGHTS_FILE, help="where to export the best weights")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    tune(parse_args())